@@ -6,11 +6,13 @@
 # LICENSE file in the root directory of this source tree.
 
 import unittest
+from dataclasses import dataclass
 from typing import Tuple
+from unittest.mock import MagicMock
 
 import torch
 from torch.utils.data.dataset import Dataset, TensorDataset
-from torchtnt.data.data_prefetcher import CudaDataPrefetcher
+from torchtnt.data.data_prefetcher import _record_stream, CudaDataPrefetcher
 
 Batch = Tuple[torch.Tensor, torch.Tensor]
 
@@ -38,6 +40,28 @@ class DataTest(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "expects a CUDA device"):
             _ = CudaDataPrefetcher(dataloader, device, num_prefetch_batches)
 
+    def test_record_stream(self) -> None:
+        """
+        Test _record_stream records the stream on every tensor of a nested batch
+        """
+
+        @dataclass
+        class Sample:
+            inputs: torch.Tensor
+            label: int
+
+        stream = MagicMock()
+        tensors = [MagicMock(spec=torch.Tensor) for _ in range(4)]
+        batch = (
+            tensors[0],
+            [tensors[1], {"key": tensors[2]}],
+            Sample(inputs=tensors[3], label=1),
+            "not a tensor",
+        )
+        _record_stream(batch, stream)
+        for t in tensors:
+            t.record_stream.assert_called_once_with(stream)
+
     @unittest.skipUnless(
         condition=cuda_available, reason="This test needs a GPU host to run."
     )
@@ -5,19 +5,28 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import unittest
 from typing import Iterator, Tuple
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import torch
 from torch import nn
-from torchtnt.runner._test_utils import DummyEvalUnit, generate_random_dataloader
-from torchtnt.runner.evaluate import evaluate
-from torchtnt.runner.state import State
-from torchtnt.runner.unit import EvalUnit
+from torchtnt.runner._test_utils import (
+    DummyEvalUnit,
+    generate_random_dataloader,
+    RecordingEvalUnit,
+)
+from torchtnt.runner.callback import Callback
+from torchtnt.runner.evaluate import _get_prefetch_device, evaluate
+from torchtnt.runner.state import current_state, State
+from torchtnt.runner.unit import EvalUnit, TEvalUnit
 
 
 class EvaluateTest(unittest.TestCase):
+
+    cuda_available = torch.cuda.is_available()
+
     def test_evaluate(self) -> None:
         """
         Test evaluate entry point
@@ -43,6 +52,18 @@ class EvaluateTest(unittest.TestCase):
 
         self.assertEqual(my_unit.module.training, initial_training_mode)
 
+    def test_evaluate_inference_mode(self) -> None:
+        """
+        Test evaluate entry point runs steps under inference mode
+        """
+        my_unit = RecordingEvalUnit(
+            lambda state, data: torch.is_inference_mode_enabled()
+        )
+        dataloader = generate_random_dataloader(10, 2, 2)
+        evaluate(my_unit, dataloader)
+
+        self.assertEqual(my_unit.records, [True] * 5)
+
     def test_evaluate_max_steps_per_epoch(self) -> None:
         """
         Test evaluate entry point with max_steps_per_epoch
@@ -131,6 +152,104 @@ class EvaluateTest(unittest.TestCase):
 
         self.assertEqual(my_unit.module.training, initial_training_mode)
 
+    @unittest.skipUnless(
+        condition=cuda_available, reason="This test needs a GPU host to run."
+    )
+    def test_evaluate_prefetch(self) -> None:
+        """
+        Test evaluate entry point moves batches to the module's device when prefetching
+        """
+        input_dim = 2
+        dataset_len = 10
+        batch_size = 2
+        expected_steps = dataset_len / batch_size
+
+        cpu_module = nn.Linear(input_dim, 2)
+        module = copy.deepcopy(cpu_module).to(torch.device("cuda"))
+        my_unit = RecordingEvalUnit(
+            lambda state, data: (data[0].device.type, module(data[0]).cpu()),
+            module=module,
+        )
+
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+
+        state = evaluate(my_unit, dataloader, prefetch=True)
+
+        self.assertEqual(state.eval_state.progress.num_epochs_completed, 1)
+        self.assertEqual(state.eval_state.progress.num_steps_completed, expected_steps)
+
+        with torch.no_grad():
+            expected_outputs = [cpu_module(inputs) for inputs, _ in dataloader]
+        self.assertEqual(len(my_unit.records), len(expected_outputs))
+        for (device_type, outputs), expected in zip(my_unit.records, expected_outputs):
+            self.assertEqual(device_type, "cuda")
+            self.assertTrue(torch.allclose(outputs, expected, atol=1e-6))
+
+    def test_evaluate_prefetch_wraps_data_iter(self) -> None:
+        """
+        Test evaluate entry point only wraps the data iterator in a prefetcher when there's a device to prefetch to
+        """
+        device = torch.device("cuda", 0)
+        dataloader = generate_random_dataloader(10, 2, 2)
+
+        with patch(
+            "torchtnt.runner.evaluate._get_prefetch_device", return_value=device
+        ), patch(
+            "torchtnt.runner.evaluate.CudaDataPrefetcher",
+            side_effect=lambda data_iter, device: data_iter,
+        ) as prefetcher_mock:
+            state = evaluate(DummyEvalUnit(input_dim=2), dataloader, prefetch=True)
+        prefetcher_mock.assert_called_once()
+        self.assertEqual(prefetcher_mock.call_args[0][1], device)
+        self.assertEqual(state.eval_state.progress.num_steps_completed, 5)
+
+        with patch(
+            "torchtnt.runner.evaluate._get_prefetch_device", return_value=None
+        ), patch("torchtnt.runner.evaluate.CudaDataPrefetcher") as prefetcher_mock:
+            state = evaluate(DummyEvalUnit(input_dim=2), dataloader, prefetch=True)
+        prefetcher_mock.assert_not_called()
+        self.assertEqual(state.eval_state.progress.num_steps_completed, 5)
+
+        with patch(
+            "torchtnt.runner.evaluate._get_prefetch_device", return_value=device
+        ) as get_device_mock, patch(
+            "torchtnt.runner.evaluate.CudaDataPrefetcher"
+        ) as prefetcher_mock:
+            evaluate(DummyEvalUnit(input_dim=2), dataloader, prefetch=False)
+        get_device_mock.assert_not_called()
+        prefetcher_mock.assert_not_called()
+
+    def test_get_prefetch_device(self) -> None:
+        """
+        Test prefetching is only enabled for modules on a CUDA device
+        """
+        cuda_device = torch.device("cuda", 0)
+        cuda_param = MagicMock(device=cuda_device)
+        cuda_module = MagicMock(spec=nn.Module)
+        cuda_module.parameters.side_effect = lambda: iter([cuda_param])
+
+        with patch("torch.cuda.is_available", return_value=False):
+            self.assertIsNone(_get_prefetch_device({"module": cuda_module}))
+
+        with patch("torch.cuda.is_available", return_value=True):
+            self.assertEqual(_get_prefetch_device({"module": cuda_module}), cuda_device)
+            # CPU parameters
+            self.assertIsNone(_get_prefetch_device({"module": nn.Linear(2, 2)}))
+            # no tracked modules
+            self.assertIsNone(_get_prefetch_device({}))
+            # the first module has no parameters, so the next one decides
+            self.assertEqual(
+                _get_prefetch_device(
+                    {"loss_fn": nn.CrossEntropyLoss(), "module": cuda_module}
+                ),
+                cuda_device,
+            )
+            self.assertIsNone(
+                _get_prefetch_device(
+                    {"loss_fn": nn.CrossEntropyLoss(), "module": nn.Linear(2, 2)}
+                )
+            )
+
     def test_evaluate_with_callback(self) -> None:
         """
         Test evaluate entry point with a callback
@@ -159,6 +278,151 @@ class EvaluateTest(unittest.TestCase):
         self.assertEqual(callback_mock.on_eval_epoch_end.call_count, 1)
         self.assertEqual(callback_mock.on_eval_end.call_count, 1)
 
+    def test_evaluate_progress_in_step(self) -> None:
+        """
+        Test progress is up to date when read from within eval_step
+        """
+        my_unit = RecordingEvalUnit(
+            lambda state, data: state.eval_state.progress.num_steps_completed
+        )
+        dataloader = generate_random_dataloader(10, 2, 2)
+        evaluate(my_unit, dataloader)
+
+        self.assertEqual(my_unit.records, [0, 1, 2, 3, 4])
+
+    def test_evaluate_current_state(self) -> None:
+        """
+        Test current_state returns the evaluate entry point's State from within the loop
+        """
+        my_unit = RecordingEvalUnit(lambda state, data: (state, current_state()))
+        dataloader = generate_random_dataloader(10, 2, 2)
+        evaluate(my_unit, dataloader)
+
+        self.assertEqual(len(my_unit.records), 5)
+        for state, step_current_state in my_unit.records:
+            self.assertIs(step_current_state, state)
+
+    def test_evaluate_reuse_batch_buffer(self) -> None:
+        """
+        Test evaluate entry point with reuse_batch_buffer
+        """
+        input_dim = 2
+        dataset_len = 9
+        batch_size = 2
+
+        my_unit = RecordingEvalUnit(
+            lambda state, data: (data[0].data_ptr(), data[0].clone())
+        )
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        evaluate(my_unit, dataloader, reuse_batch_buffer=True)
+
+        data_ptrs = [data_ptr for data_ptr, _ in my_unit.records]
+        expected_inputs = [inputs for inputs, _ in dataloader]
+        self.assertEqual(len(my_unit.records), len(expected_inputs))
+        for (_, inputs), expected in zip(my_unit.records, expected_inputs):
+            self.assertTrue(torch.equal(inputs, expected))
+
+        # full batches take turns using the buffers (two sets when they're pinned),
+        # the smaller final batch is passed through
+        num_buffers = 2 if self.cuda_available else 1
+        self.assertEqual(len(set(data_ptrs[:-1])), num_buffers)
+        self.assertEqual(data_ptrs[:-1], data_ptrs[:num_buffers] * (4 // num_buffers))
+        self.assertNotIn(data_ptrs[-1], data_ptrs[:-1])
+
+    def test_evaluate_reuse_batch_buffer_data_iter_step(self) -> None:
+        """
+        Test evaluate entry point rejects reuse_batch_buffer when eval_step takes the data iterator
+        """
+
+        class EvalIteratorUnit(EvalUnit[Iterator[Tuple[torch.Tensor, torch.Tensor]]]):
+            def eval_step(
+                self, state: State, data: Iterator[Tuple[torch.Tensor, torch.Tensor]]
+            ) -> None:
+                next(data)
+                next(data)
+
+        my_unit = EvalIteratorUnit()
+        dataloader = generate_random_dataloader(10, 2, 2)
+        with self.assertRaisesRegex(ValueError, "reuse_batch_buffer is not supported"):
+            evaluate(my_unit, dataloader, reuse_batch_buffer=True)
+
+    def test_evaluate_compile_step(self) -> None:
+        """
+        Test evaluate entry point with compile_step
+        """
+        input_dim = 2
+        dataset_len = 10
+        batch_size = 2
+        expected_steps = dataset_len / batch_size
+
+        my_unit = DummyEvalUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+
+        compiled_step = MagicMock(wraps=my_unit.eval_step)
+        with patch("torch.compile", return_value=compiled_step) as compile_mock:
+            state = evaluate(my_unit, dataloader, compile_step=True)
+
+        compile_mock.assert_called_once_with(
+            my_unit.eval_step, mode="reduce-overhead", dynamic=False
+        )
+        self.assertEqual(compiled_step.call_count, expected_steps)
+        self.assertEqual(state.eval_state.progress.num_steps_completed, expected_steps)
+
+        with patch("torch.compile", return_value=compiled_step) as compile_mock:
+            evaluate(my_unit, dataloader, compile_step="max-autotune")
+        compile_mock.assert_called_once_with(
+            my_unit.eval_step, mode="max-autotune", dynamic=False
+        )
+
+    def test_evaluate_default_callback_hooks_skipped(self) -> None:
+        """
+        Test evaluate entry point doesn't dispatch to hooks a callback doesn't override
+        """
+        input_dim = 2
+        dataset_len = 10
+        batch_size = 2
+
+        my_unit = DummyEvalUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        state = evaluate(my_unit, dataloader, callbacks=[Callback()])
+
+        self.assertFalse(
+            any(
+                action.startswith("callback.")
+                for action in state.timer.recorded_durations.keys()
+            )
+        )
+        # step_output should be reset to None
+        self.assertEqual(state.eval_state.step_output, None)
+
+    def test_evaluate_step_output_in_callback(self) -> None:
+        """
+        Test step_output is available to callbacks in on_eval_step_end
+        """
+
+        class StepOutputCallback(Callback):
+            def __init__(self) -> None:
+                self.step_outputs = []
+
+            def on_eval_step_end(self, state: State, unit: TEvalUnit) -> None:
+                self.step_outputs.append(state.eval_state.step_output)
+
+        input_dim = 2
+        dataset_len = 10
+        batch_size = 2
+        expected_num_steps = dataset_len / batch_size
+
+        my_unit = DummyEvalUnit(input_dim=input_dim)
+        dataloader = generate_random_dataloader(dataset_len, input_dim, batch_size)
+        callback = StepOutputCallback()
+        state = evaluate(my_unit, dataloader, callbacks=[callback])
+
+        self.assertEqual(len(callback.step_outputs), expected_num_steps)
+        for step_output in callback.step_outputs:
+            self.assertIsNotNone(step_output)
+        # step_output should be reset to None
+        self.assertEqual(state.eval_state.step_output, None)
+
 
 class StopEvalUnit(EvalUnit[Tuple[torch.Tensor, torch.Tensor]]):
     def __init__(self, input_dim: int, steps_before_stopping: int) -> None:
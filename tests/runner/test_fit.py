@@ -7,14 +7,19 @@
 
 import unittest
 from typing import Tuple
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import torch
 from torch import nn
-from torchtnt.runner._test_utils import DummyFitUnit, generate_random_dataloader
+from torch.utils.data import DataLoader
+from torchtnt.runner._test_utils import (
+    DummyFitUnit,
+    generate_random_dataloader,
+    generate_random_dataset,
+)
 from torchtnt.runner.callback import Callback
-from torchtnt.runner.fit import fit
-from torchtnt.runner.state import State
+from torchtnt.runner.fit import _maybe_warn_non_persistent_workers, fit
+from torchtnt.runner.state import PhaseState, State
 from torchtnt.runner.unit import EvalUnit, TrainUnit
 
 
@@ -221,6 +226,28 @@ class FitTest(unittest.TestCase):
         )
         self.assertEqual(my_unit.eval_step.call_count, expected_eval_steps_per_epoch)
 
+    def test_fit_warn_non_persistent_workers(self) -> None:
+        """
+        Test the warning for eval dataloaders which respawn workers on every evaluation
+        """
+        dataset = generate_random_dataset(8, 2)
+
+        eval_state = PhaseState(
+            dataloader=DataLoader(dataset, num_workers=2),
+            evaluate_every_n_steps=2,
+        )
+        with self.assertLogs(level="WARNING") as log:
+            _maybe_warn_non_persistent_workers(eval_state)
+        self.assertIn("persistent_workers=True", log.output[0])
+
+        eval_state = PhaseState(
+            dataloader=DataLoader(dataset, num_workers=2, persistent_workers=True),
+            evaluate_every_n_steps=2,
+        )
+        with patch("torchtnt.runner.fit.logger.warning") as warning_mock:
+            _maybe_warn_non_persistent_workers(eval_state)
+        warning_mock.assert_not_called()
+
     def test_fit_with_callback(self) -> None:
         """
         Test fit entry point with a callback
@@ -8,7 +8,14 @@
 import unittest
 
 from torchtnt.runner.progress import Progress
-from torchtnt.runner.state import _check_loop_condition, PhaseState
+from torchtnt.runner.state import (
+    _check_loop_condition,
+    _current_state,
+    current_state,
+    EntryPoint,
+    PhaseState,
+    State,
+)
 
 
 class StateTest(unittest.TestCase):
@@ -38,3 +45,17 @@ class StateTest(unittest.TestCase):
             ValueError, "Invalid value provided for evaluate_every_n_epochs"
         ):
             PhaseState(progress=Progress(), dataloader=[], evaluate_every_n_epochs=-2)
+
+    def test_current_state(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "while an entry point is running"):
+            current_state()
+
+        state = State(entry_point=EntryPoint.EVALUATE)
+        token = _current_state.set(state)
+        try:
+            self.assertIs(current_state(), state)
+        finally:
+            _current_state.reset(token)
+
+        with self.assertRaisesRegex(RuntimeError, "while an entry point is running"):
+            current_state()
@@ -5,9 +5,12 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import gc
 import unittest
+import weakref
+from dataclasses import dataclass
 from typing import Iterator, Union
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import torch.distributed as dist
 
@@ -22,8 +25,10 @@ from torchtnt.runner.progress import Progress
 from torchtnt.runner.state import EntryPoint, State
 from torchtnt.runner.unit import TEvalUnit, TPredictUnit, TTrainUnit
 from torchtnt.runner.utils import (
+    _get_callback_fns,
     _is_done,
     _is_epoch_done,
+    _make_callback_dispatcher,
     _maybe_set_distributed_sampler_epoch,
     _reset_module_training_mode,
     _run_callback_fn,
@@ -109,6 +114,60 @@ class UtilsTest(unittest.TestCase):
         self.assertTrue(module.training)
         self.assertTrue(loss_fn.training)
 
+    def test_reset_module_training_mode_nested(self) -> None:
+        """
+        Test _reset_module_training_mode when a tracked module is a submodule of another
+        """
+        for child_mode in (True, False):
+            for child_first in (True, False):
+                child = nn.Linear(1, 1)
+                parent = nn.Sequential(child, nn.Dropout())
+                child.train(child_mode)
+
+                tracked_modules = (
+                    {"child": child, "parent": parent}
+                    if child_first
+                    else {"parent": parent, "child": child}
+                )
+
+                prior_module_train_states = _set_module_training_mode(
+                    tracked_modules, False
+                )
+
+                self.assertFalse(parent.training)
+                self.assertFalse(child.training)
+
+                _reset_module_training_mode(tracked_modules, prior_module_train_states)
+
+                self.assertTrue(parent.training)
+                self.assertTrue(parent[1].training)
+                self.assertEqual(child.training, child_mode)
+
+    def test_set_module_training_mode_unchanged(self) -> None:
+        """
+        Test _set_module_training_mode skips modules already in the requested mode
+        """
+        module = nn.Sequential(nn.Linear(1, 1), nn.Dropout())
+        module.eval()
+        # a module with a submodule in a different mode still gets set
+        mixed_module = nn.Sequential(nn.Linear(1, 1), nn.Dropout())
+        mixed_module.eval()
+        mixed_module[1].train()
+
+        tracked_modules = {"module": module, "mixed_module": mixed_module}
+
+        with patch.object(module, "train", wraps=module.train) as train_mock:
+            prior_module_train_states = _set_module_training_mode(
+                tracked_modules, False
+            )
+            train_mock.assert_not_called()
+            _reset_module_training_mode(tracked_modules, prior_module_train_states)
+            train_mock.assert_not_called()
+
+        self.assertFalse(prior_module_train_states["module"])
+        self.assertFalse(prior_module_train_states["mixed_module"])
+        self.assertFalse(mixed_module[1].training)
+
     def test_run_callback_fn_hooks(self) -> None:
         """
         Test _run_callback_fn with all of the hooks on Callback
@@ -201,6 +260,47 @@ class UtilsTest(unittest.TestCase):
                 [callback], "on_train_finish", dummy_train_state, train_unit
             )
 
+    def test_get_callback_fns(self) -> None:
+        """
+        Test _get_callback_fns skips hooks which aren't overridden
+        """
+        callback = DummyCallback("train")
+
+        callback_fns = _get_callback_fns([callback], "on_train_start")
+        self.assertEqual(len(callback_fns), 1)
+        label, fn = callback_fns[0]
+        self.assertEqual(label, "callback.DummyCallback.on_train_start")
+        fn(MagicMock(), MagicMock())
+        self.assertEqual(callback.dummy_data, "on_train_start")
+
+        self.assertEqual(_get_callback_fns([callback], "on_eval_start"), [])
+
+        with self.assertRaisesRegex(
+            ValueError, "Invalid callback method name provided"
+        ):
+            _get_callback_fns([callback], "dummy_attr")
+
+    def test_make_callback_dispatcher(self) -> None:
+        """
+        Test _make_callback_dispatcher runs and times the resolved hooks
+        """
+        callback = DummyCallback("train")
+        timer = Timer()
+        dummy_train_state = State(
+            entry_point=EntryPoint.TRAIN,
+            timer=timer,
+            train_state=None,
+        )
+
+        self.assertIsNone(_make_callback_dispatcher([callback], "on_eval_start"))
+
+        dispatch = _make_callback_dispatcher([callback], "on_train_start")
+        dispatch(dummy_train_state, MagicMock())
+        self.assertEqual(callback.dummy_data, "on_train_start")
+        self.assertTrue(
+            "callback.DummyCallback.on_train_start" in timer.recorded_durations.keys()
+        )
+
     def test_step_func_requires_iterator(self) -> None:
         class Foo:
             def bar(self) -> None:
@@ -218,6 +318,37 @@ class UtilsTest(unittest.TestCase):
         self.assertTrue(_step_requires_iterator(foo.baz))
         self.assertTrue(_step_requires_iterator(dummy))
 
+        # signatures are inspected once per function, not once per instance
+        with patch(
+            "torchtnt.runner.utils._func_requires_iterator"
+        ) as requires_iterator_mock:
+            self.assertTrue(_step_requires_iterator(Foo().baz))
+        requires_iterator_mock.assert_not_called()
+
+        # the cache doesn't keep step functions alive
+        def closure(data: Iterator[int]) -> None:
+            pass
+
+        self.assertTrue(_step_requires_iterator(closure))
+        closure_ref = weakref.ref(closure)
+        del closure
+        gc.collect()
+        self.assertIsNone(closure_ref())
+
+    def test_step_func_requires_iterator_unhashable(self) -> None:
+        """
+        Test _step_requires_iterator with a step callable which can't be hashed
+        """
+
+        @dataclass
+        class Step:
+            value: int
+
+            def __call__(self, state: State, data: Iterator[int]) -> None:
+                pass
+
+        self.assertTrue(_step_requires_iterator(Step(value=1)))
+
     def test_is_done(self) -> None:
         p = Progress(
             num_epochs_completed=2,
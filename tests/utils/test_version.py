@@ -52,6 +52,7 @@ class TestVersion(unittest.TestCase):
             self.assertFalse(version.is_torch_version_geq_1_10())
             self.assertFalse(version.is_torch_version_geq_1_11())
             self.assertFalse(version.is_torch_version_geq_1_12())
+            self.assertFalse(version.is_torch_version_geq_2_0())
 
         with patch.object(torch, "__version__", "1.8.0"):
             self.assertTrue(version.is_torch_version_geq_1_8())
@@ -59,6 +60,7 @@ class TestVersion(unittest.TestCase):
             self.assertFalse(version.is_torch_version_geq_1_10())
             self.assertFalse(version.is_torch_version_geq_1_11())
             self.assertFalse(version.is_torch_version_geq_1_12())
+            self.assertFalse(version.is_torch_version_geq_2_0())
 
         with patch.object(torch, "__version__", "1.9.0"):
             self.assertTrue(version.is_torch_version_geq_1_8())
@@ -66,6 +68,7 @@ class TestVersion(unittest.TestCase):
             self.assertFalse(version.is_torch_version_geq_1_10())
             self.assertFalse(version.is_torch_version_geq_1_11())
             self.assertFalse(version.is_torch_version_geq_1_12())
+            self.assertFalse(version.is_torch_version_geq_2_0())
 
         with patch.object(torch, "__version__", "1.10.0"):
             self.assertTrue(version.is_torch_version_geq_1_8())
@@ -73,6 +76,7 @@ class TestVersion(unittest.TestCase):
             self.assertTrue(version.is_torch_version_geq_1_10())
             self.assertFalse(version.is_torch_version_geq_1_11())
             self.assertFalse(version.is_torch_version_geq_1_12())
+            self.assertFalse(version.is_torch_version_geq_2_0())
 
         with patch.object(torch, "__version__", "1.11.0"):
             self.assertTrue(version.is_torch_version_geq_1_8())
@@ -80,6 +84,7 @@ class TestVersion(unittest.TestCase):
             self.assertTrue(version.is_torch_version_geq_1_10())
             self.assertTrue(version.is_torch_version_geq_1_11())
             self.assertFalse(version.is_torch_version_geq_1_12())
+            self.assertFalse(version.is_torch_version_geq_2_0())
 
         with patch.object(torch, "__version__", "1.12.0"):
             self.assertTrue(version.is_torch_version_geq_1_8())
@@ -87,3 +92,8 @@ class TestVersion(unittest.TestCase):
             self.assertTrue(version.is_torch_version_geq_1_10())
             self.assertTrue(version.is_torch_version_geq_1_11())
             self.assertTrue(version.is_torch_version_geq_1_12())
+            self.assertFalse(version.is_torch_version_geq_2_0())
+
+        with patch.object(torch, "__version__", "2.0.0"):
+            self.assertTrue(version.is_torch_version_geq_1_12())
+            self.assertTrue(version.is_torch_version_geq_2_0())
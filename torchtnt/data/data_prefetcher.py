@@ -4,7 +4,8 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Iterable, Iterator, List, TypeVar
+from dataclasses import fields, is_dataclass
+from typing import Any, Iterable, Iterator, List, Mapping, TypeVar
 
 import torch
 from torchtnt.utils.device import copy_data_to_device
@@ -107,6 +108,10 @@ class CudaDataPrefetcher(Iterator[Batch]):
             # there are pre-fetched batches already from a previous `prefetching` call.
             # consume one
             batch = self._batches.pop(0)
+            # the batch was allocated on the prefetch stream, so tell the caching allocator
+            # it's used on the current stream too. Otherwise its memory could be handed to
+            # the next prefetched batch while the current stream is still reading it
+            _record_stream(batch, torch.cuda.current_stream())
             # refill the consumed batch
             try:
                 self._fetch_next_batch(self.data_iter)
@@ -117,3 +122,18 @@ class CudaDataPrefetcher(Iterator[Batch]):
             raise StopIteration
 
         return batch
+
+
+def _record_stream(data: Any, stream: torch.cuda.Stream) -> None:
+    """Calls ``record_stream`` on every tensor in ``data``."""
+    if isinstance(data, torch.Tensor):
+        data.record_stream(stream)
+    elif isinstance(data, (list, tuple)):
+        for e in data:
+            _record_stream(e, stream)
+    elif isinstance(data, Mapping):
+        for v in data.values():
+            _record_stream(v, stream)
+    elif is_dataclass(data) and not isinstance(data, type):
+        for field in fields(data):
+            _record_stream(getattr(data, field.name), stream)
@@ -9,7 +9,7 @@ from .evaluate import evaluate
 from .fit import fit
 from .predict import predict
 from .progress import Progress
-from .state import PhaseState, State
+from .state import current_state, PhaseState, State
 from .train import train
 from .unit import EvalUnit, PredictUnit, TrainUnit
 
@@ -21,6 +21,7 @@ __all__ = [
     "Progress",
     "PhaseState",
     "State",
+    "current_state",
     "train",
     "EvalUnit",
     "PredictUnit",
@@ -5,7 +5,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 import torch
 from torch import nn
@@ -31,6 +31,24 @@ class DummyEvalUnit(EvalUnit[Batch]):
         return loss, outputs
 
 
+class RecordingEvalUnit(EvalUnit[Batch]):
+    """Calls ``probe`` on every step and appends its return value to ``records``."""
+
+    def __init__(
+        self,
+        probe: Callable[[State, Batch], Any],
+        module: Optional[nn.Module] = None,
+    ) -> None:
+        super().__init__()
+        if module is not None:
+            self.module = module
+        self.probe = probe
+        self.records: List[Any] = []
+
+    def eval_step(self, state: State, data: Batch) -> None:
+        self.records.append(self.probe(state, data))
+
+
 class DummyPredictUnit(PredictUnit[Batch]):
     def __init__(self, input_dim: int) -> None:
         super().__init__()
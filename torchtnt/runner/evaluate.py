@@ -5,15 +5,17 @@
 # LICENSE file in the root directory of this source tree.
 
 import logging
-from typing import Iterable, List, Optional
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 import torch
+from torchtnt.data.data_prefetcher import CudaDataPrefetcher
 from torchtnt.runner.callback import Callback
 
-from torchtnt.runner.state import EntryPoint, PhaseState, State
+from torchtnt.runner.state import _current_state, EntryPoint, PhaseState, State
 from torchtnt.runner.unit import TEvalData, TEvalUnit
 from torchtnt.runner.utils import (
-    _is_epoch_done,
+    _make_callback_dispatcher,
     _reset_module_training_mode,
     _run_callback_fn,
     _set_module_training_mode,
@@ -21,6 +23,7 @@ from torchtnt.runner.utils import (
     log_api_usage,
 )
 from torchtnt.utils.timer import get_timer_summary
+from torchtnt.utils.version import is_torch_version_geq_2_0
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -31,15 +34,41 @@ def evaluate(
     *,
     callbacks: Optional[List[Callback]] = None,
     max_steps_per_epoch: Optional[int] = None,
+    prefetch: bool = True,
+    reuse_batch_buffer: bool = False,
+    compile_step: Union[bool, str] = False,
 ) -> State:
     """
     The `evaluate` entry point takes in an EvalUnit and dataloader and runs the evaluation loop over the data.
 
+    The hooks and steps run under ``torch.inference_mode``, so any tensors they create or reassign, such as metric
+    state reset in ``on_eval_epoch_start``, lazily built buffers or ``nn.LazyLinear`` parameters, become inference
+    tensors. These can't be updated in place or used in autograd afterwards, which fails if the unit is trained after
+    calling `evaluate`. To interleave evaluation with training, use the `fit` entry point, which evaluates under
+    ``torch.no_grad`` instead.
+
     Args:
         eval_unit: an instance of EvalUnit which implements `eval_step`.
         dataloader: dataloader to be used during evaluation.
         callbacks: an optional list of callbacks.
         max_steps_per_epoch: the max number of steps to run per epoch. None means evaluate until the dataloader is exhausted.
+        prefetch: whether to copy the next batch to the device on a side stream while the current step runs.
+            Only takes effect when the tracked modules live on a CUDA device. For the copies to be asynchronous,
+            the dataloader should return pinned memory, e.g. ``DataLoader(..., pin_memory=True)``. As this is on by
+            default, ``eval_step`` receives batches already on the modules' CUDA device in that case, so host-only
+            operations on them such as ``.numpy()`` fail; pass ``prefetch=False`` to get the dataloader's batches as is.
+        reuse_batch_buffer: whether to copy each batch into buffers allocated from the first batch instead of handing
+            a fresh batch to every step. If CUDA is available, two sets of pinned buffers are used in turn, and before
+            refilling one the host waits for the device work queued up to the previous batch, which costs a host sync
+            per step but leaves the latest step queued. Only supported for batches which are a tensor or a tuple/list
+            of tensors; batches of a different shape, such as a smaller final batch, are passed through as is.
+            ``eval_step`` must not keep references to the batch across steps, and can't take the data iterator.
+        compile_step: whether to compile ``eval_step`` with ``torch.compile`` before running the loop. ``True`` uses
+            the ``"reduce-overhead"`` mode, which captures CUDA graphs across steps; a string selects another
+            ``torch.compile`` mode. Works best with fixed batch shapes, e.g. together with ``reuse_batch_buffer``.
+            With ``"reduce-overhead"``, the outputs of ``eval_step`` are overwritten by the next step, so neither the
+            unit nor ``on_eval_step_end`` callbacks may keep them across steps without cloning them.
+            Requires PyTorch 2.0 or later.
 
     Returns:
         a State object containing metadata about the evaluation run.
@@ -53,10 +82,19 @@ def evaluate(
             max_steps_per_epoch=max_steps_per_epoch,
         ),
     )
+    token = _current_state.set(state)
     try:
-        _evaluate_impl(state, eval_unit, callbacks)
+        _evaluate_impl(
+            state,
+            eval_unit,
+            callbacks,
+            prefetch=prefetch,
+            reuse_batch_buffer=reuse_batch_buffer,
+            compile_step=compile_step,
+        )
         logger.info("Finished evaluation")
-        logger.debug(get_timer_summary(state.timer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(get_timer_summary(state.timer))
         return state
     except Exception as e:
         # TODO: log for diagnostics
@@ -64,20 +102,58 @@ def evaluate(
         eval_unit.on_exception(state, e)
         _run_callback_fn(callbacks, "on_exception", state, eval_unit, e)
         raise e
+    finally:
+        _current_state.reset(token)
 
 
-@torch.no_grad()
 def _evaluate_impl(
     state: State,
     eval_unit: TEvalUnit,
     callbacks: List[Callback],
+    *,
+    prefetch: bool = False,
+    reuse_batch_buffer: bool = False,
+    compile_step: Union[bool, str] = False,
+) -> None:
+    # inference_mode is cheaper than no_grad, but tensors created under it can't be used
+    # in autograd afterwards, so only use it when no training follows the evaluation
+    grad_mode = (
+        torch.inference_mode()
+        if state.entry_point == EntryPoint.EVALUATE
+        else torch.no_grad()
+    )
+    with grad_mode:
+        _evaluate_loop(
+            state,
+            eval_unit,
+            callbacks,
+            prefetch=prefetch,
+            reuse_batch_buffer=reuse_batch_buffer,
+            compile_step=compile_step,
+        )
+
+
+def _evaluate_loop(
+    state: State,
+    eval_unit: TEvalUnit,
+    callbacks: List[Callback],
+    *,
+    prefetch: bool,
+    reuse_batch_buffer: bool,
+    compile_step: Union[bool, str],
 ) -> None:
     # input validation
     eval_state = state.eval_state
     if not eval_state:
         raise RuntimeError("Expected eval_state to be initialized!")
+    pass_data_iter_to_step = _step_requires_iterator(eval_unit.eval_step)
+    if reuse_batch_buffer and pass_data_iter_to_step:
+        # a step pulling several batches from the iterator would get them in the same buffers
+        raise ValueError(
+            "reuse_batch_buffer is not supported when eval_step takes the data iterator."
+        )
     logger.info(
-        f"Started evaluate with max_steps_per_epoch={eval_state.max_steps_per_epoch}"
+        "Started evaluate with max_steps_per_epoch=%s", eval_state.max_steps_per_epoch
     )
 
     # Set all modules to eval mode
@@ -85,65 +161,216 @@ def _evaluate_impl(
     tracked_modules = eval_unit.tracked_modules()
     prior_module_train_states = _set_module_training_mode(tracked_modules, False)
 
-    with state.timer.time(f"eval.{eval_unit.__class__.__name__}.on_eval_start"):
+    # intern the timer labels so that repeated calls (e.g. from fit) reuse the same
+    # string objects, which the timer's dict lookups can match by identity
+    unit_name = eval_unit.__class__.__name__
+    timer_labels = {
+        name: sys.intern(f"eval.{unit_name}.{name}")
+        for name in (
+            "on_eval_start",
+            "on_eval_epoch_start",
+            "eval_step",
+            "on_eval_epoch_end",
+            "on_eval_end",
+        )
+    }
+
+    # resolve the callback hooks once rather than looking them up on every call
+    on_eval_start = _make_callback_dispatcher(callbacks, "on_eval_start")
+    on_eval_epoch_start = _make_callback_dispatcher(callbacks, "on_eval_epoch_start")
+    on_eval_step_start = _make_callback_dispatcher(callbacks, "on_eval_step_start")
+    on_eval_step_end = _make_callback_dispatcher(callbacks, "on_eval_step_end")
+    on_eval_epoch_end = _make_callback_dispatcher(callbacks, "on_eval_epoch_end")
+    on_eval_end = _make_callback_dispatcher(callbacks, "on_eval_end")
+
+    with state.timer.time(timer_labels["on_eval_start"]):
         eval_unit.on_eval_start(state)
-    _run_callback_fn(callbacks, "on_eval_start", state, eval_unit)
+    if on_eval_start is not None:
+        on_eval_start(state, eval_unit)
 
     # Conditionally run this to avoid running this multiple times
     # in the case of resuming from a checkpoint mid-epoch
     if eval_state.progress.num_steps_completed_in_epoch == 0:
-        with state.timer.time(
-            f"eval.{eval_unit.__class__.__name__}.on_eval_epoch_start"
-        ):
+        with state.timer.time(timer_labels["on_eval_epoch_start"]):
             eval_unit.on_eval_epoch_start(state)
-        _run_callback_fn(callbacks, "on_eval_epoch_start", state, eval_unit)
+        if on_eval_epoch_start is not None:
+            on_eval_epoch_start(state, eval_unit)
 
     data_iter = iter(eval_state.dataloader)
-    step_input = data_iter
+    if reuse_batch_buffer:
+        data_iter = _reuse_batch_buffer(data_iter)
+    prefetch_device = _get_prefetch_device(tracked_modules) if prefetch else None
+    if prefetch_device is not None:
+        # overlap the host to device copy of the next batch with the current step
+        data_iter = CudaDataPrefetcher(data_iter, prefetch_device)
 
-    pass_data_iter_to_step = _step_requires_iterator(eval_unit.eval_step)
     prev_steps_in_epoch = eval_state.progress.num_steps_completed_in_epoch
 
-    while not (
-        state.should_stop
-        or _is_epoch_done(
-            eval_state.progress, eval_state.max_steps_per_epoch, eval_state.max_steps
-        )
-    ):
-        try:
-            if not pass_data_iter_to_step:
+    data_iter_next_label = "eval.data_iter_next"
+    eval_step_label = timer_labels["eval_step"]
+
+    # bind loop invariants to locals to avoid repeated attribute lookups per step
+    timer = state.timer
+    progress = eval_state.progress
+    # same check as _is_epoch_done, with no limit mapped to sys.maxsize so the
+    # loop condition is just two integer comparisons
+    max_steps_per_epoch = eval_state.max_steps_per_epoch
+    if max_steps_per_epoch is None:
+        max_steps_per_epoch = sys.maxsize
+    max_steps = eval_state.max_steps
+    if max_steps is None:
+        max_steps = sys.maxsize
+    eval_step = eval_unit.eval_step
+    if compile_step:
+        eval_step = _compile_step(eval_step, compile_step)
+
+    # pass_data_iter_to_step doesn't change during the epoch, so branch on it once and
+    # keep the two loops below in sync
+    try:
+        if pass_data_iter_to_step:
+            while (
+                not state.should_stop
+                and progress.num_steps_completed_in_epoch < max_steps_per_epoch
+                and progress.num_steps_completed < max_steps
+            ):
+                if on_eval_step_start is not None:
+                    on_eval_step_start(state, eval_unit)
+                with timer.time(eval_step_label):
+                    step_output = eval_step(state, data_iter)
+                # the step output only needs to be exposed on the state for callbacks
+                # to read in on_eval_step_end, otherwise it's kept local so it's freed
+                # once the step ends
+                if on_eval_step_end is not None:
+                    eval_state._step_output = step_output
+                    on_eval_step_end(state, eval_unit)
+                    # clear step_output to avoid retaining extra memory
+                    eval_state._step_output = None
+                # release the output before the next batch is fetched
+                del step_output
+                # progress is updated on every step, rather than in bulk at the end
+                # of the loop, as steps and callbacks may read it
+                progress.increment_step()
+        else:
+            while (
+                not state.should_stop
+                and progress.num_steps_completed_in_epoch < max_steps_per_epoch
+                and progress.num_steps_completed < max_steps
+            ):
                 # get the next batch from the data iterator
-                with state.timer.time("eval.data_iter_next"):
+                with timer.time(data_iter_next_label):
                     step_input = next(data_iter)
-            _run_callback_fn(callbacks, "on_eval_step_start", state, eval_unit)
-            with state.timer.time(f"eval.{eval_unit.__class__.__name__}.eval_step"):
-                eval_state._step_output = eval_unit.eval_step(state, step_input)
-            _run_callback_fn(callbacks, "on_eval_step_end", state, eval_unit)
-            # clear step_output to avoid retaining extra memory
-            eval_state._step_output = None
-            eval_state.progress.increment_step()
-        except StopIteration:
-            break
+                if on_eval_step_start is not None:
+                    on_eval_step_start(state, eval_unit)
+                with timer.time(eval_step_label):
+                    step_output = eval_step(state, step_input)
+                if on_eval_step_end is not None:
+                    eval_state._step_output = step_output
+                    on_eval_step_end(state, eval_unit)
+                    eval_state._step_output = None
+                del step_output, step_input
+                progress.increment_step()
+    except StopIteration:
+        pass
 
     # Possibly warn about an empty dataloader
     any_steps_completed = (
-        abs(eval_state.progress.num_steps_completed_in_epoch - prev_steps_in_epoch) > 0
+        eval_state.progress.num_steps_completed_in_epoch != prev_steps_in_epoch
     )
     if not any_steps_completed:
         logger.warning("No steps completed during evaluate epoch!")
 
-    with state.timer.time(f"eval.{eval_unit.__class__.__name__}.on_eval_epoch_end"):
+    with state.timer.time(timer_labels["on_eval_epoch_end"]):
         eval_unit.on_eval_epoch_end(state)
-    _run_callback_fn(callbacks, "on_eval_epoch_end", state, eval_unit)
+    if on_eval_epoch_end is not None:
+        on_eval_epoch_end(state, eval_unit)
 
     # set progress counters for the next epoch
     eval_state.progress.increment_epoch()
 
-    with state.timer.time(f"eval.{eval_unit.__class__.__name__}.on_eval_end"):
+    with state.timer.time(timer_labels["on_eval_end"]):
         eval_unit.on_eval_end(state)
-    _run_callback_fn(callbacks, "on_eval_end", state, eval_unit)
+    if on_eval_end is not None:
+        on_eval_end(state, eval_unit)
 
     # Reset training mode for modules at the end of the epoch
     # This ensures that side-effects made by the loop are reset before
     # returning back to the user
     _reset_module_training_mode(tracked_modules, prior_module_train_states)
+
+
+def _get_prefetch_device(modules: Dict[str, torch.nn.Module]) -> Optional[torch.device]:
+    """Returns the CUDA device the tracked modules' parameters live on, if any."""
+    if not torch.cuda.is_available():
+        return None
+    for module in modules.values():
+        for param in module.parameters():
+            return param.device if param.device.type == "cuda" else None
+    return None
+
+
+def _compile_step(
+    step_func: Callable[..., Any], compile_step: Union[bool, str]
+) -> Callable[..., Any]:
+    if not is_torch_version_geq_2_0():
+        logger.warning(
+            "compile_step requires PyTorch 2.0 or later. Running eval_step without compiling it."
+        )
+        return step_func
+    mode = "reduce-overhead" if compile_step is True else compile_step
+    # code which can't be compiled is run eagerly by torch.compile itself
+    return torch.compile(step_func, mode=mode, dynamic=False)
+
+
+def _reuse_batch_buffer(data_iter: Iterator[TEvalData]) -> Iterator[TEvalData]:
+    """Copies each batch into buffers allocated once, from the first batch."""
+    pin_memory = torch.cuda.is_available()
+    # copies out of pinned buffers may still be in flight when the next batch arrives,
+    # so alternate between two sets of buffers to avoid waiting on the latest step
+    num_buffers = 2 if pin_memory else 1
+    buffers: List[List[torch.Tensor]] = []
+    events: List[Optional[torch.cuda.Event]] = [None] * num_buffers
+    buffer_idx = 0
+    for batch in data_iter:
+        batch_tensors = [batch] if isinstance(batch, torch.Tensor) else batch
+        if not isinstance(batch_tensors, (list, tuple)) or not all(
+            isinstance(t, torch.Tensor) and t.device.type == "cpu"
+            for t in batch_tensors
+        ):
+            yield batch
+            continue
+        if not buffers:
+            buffers = [
+                [torch.empty_like(t, pin_memory=pin_memory) for t in batch_tensors]
+                for _ in range(num_buffers)
+            ]
+        if len(batch_tensors) != len(buffers[0]) or any(
+            t.shape != buffer.shape or t.dtype != buffer.dtype
+            for t, buffer in zip(batch_tensors, buffers[0])
+        ):
+            yield batch
+            continue
+
+        event = events[buffer_idx]
+        if event is not None:
+            # wait only for the device work queued before the previous batch was
+            # requested, which includes the last copy out of these buffers
+            event.synchronize()
+        batch_buffers = buffers[buffer_idx]
+        for buffer, t in zip(batch_buffers, batch_tensors):
+            buffer.copy_(t)
+
+        if isinstance(batch, torch.Tensor):
+            yield batch_buffers[0]
+        elif isinstance(batch, tuple) and hasattr(batch, "_fields"):
+            # named tuple
+            yield type(batch)(*batch_buffers)
+        else:
+            yield type(batch)(batch_buffers)
+
+        if pin_memory:
+            # by the time the next batch is requested, the current stream has queued the
+            # step's copies out of these buffers, or waited on the prefetcher's copy
+            event = torch.cuda.Event()
+            event.record()
+            events[buffer_idx] = event
+        buffer_idx = (buffer_idx + 1) % num_buffers
@@ -7,9 +7,10 @@
 import logging
 from typing import Iterable, List, Optional
 
+import torch
 from torchtnt.runner.callback import Callback
 
-from torchtnt.runner.state import EntryPoint, PhaseState, State
+from torchtnt.runner.state import _current_state, EntryPoint, PhaseState, State
 from torchtnt.runner.train import _train_epoch_impl
 from torchtnt.runner.unit import EvalUnit, TEvalData, TrainUnit, TTrainData, TTrainUnit
 from torchtnt.runner.utils import _is_done, _run_callback_fn, log_api_usage
@@ -37,7 +38,9 @@ def fit(
     Args:
         unit: an instance of both TrainUnit EvalUnit which implements both `train_step` and `eval_step`.
         train_dataloader: dataloader to be used during training.
-        eval_dataloader: dataloader to be used during evaluation.
+        eval_dataloader: dataloader to be used during evaluation. A new iterator is created on every evaluation,
+            so when evaluating often, consider ``DataLoader(..., persistent_workers=True, pin_memory=True)``
+            to avoid respawning worker processes each time.
         callbacks: an optional list of callbacks.
         max_epochs: the max number of epochs to run for training. `None` means no limit (infinite training) unless stopped by max_steps.
         max_steps: the max number of steps to run for training. `None` means no limit (infinite training) unless stopped by max_epochs.
@@ -66,9 +69,11 @@ def fit(
             evaluate_every_n_epochs=evaluate_every_n_epochs,
         ),
     )
+    token = _current_state.set(state)
     try:
         _fit_impl(state, unit, callbacks)
-        logger.debug(get_timer_summary(state.timer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(get_timer_summary(state.timer))
         return state
     except Exception as e:
         # TODO: log for diagnostics
@@ -76,6 +81,8 @@ def fit(
         unit.on_exception(state, e)
         _run_callback_fn(callbacks, "on_exception", state, unit, e)
         raise e
+    finally:
+        _current_state.reset(token)
 
 
 def _fit_impl(
@@ -96,6 +103,8 @@ def _fit_impl(
     if not eval_state:
         raise RuntimeError("Expected eval_state to be initialized")
 
+    _maybe_warn_non_persistent_workers(eval_state)
+
     logger.info(
         f"Started fit with max_epochs={train_state.max_epochs}"
         f"max_steps={train_state.max_steps}"
@@ -118,3 +127,19 @@ def _fit_impl(
     with state.timer.time(f"train.{unit.__class__.__name__}.on_train_end"):
         unit.on_train_end(state)
     _run_callback_fn(callbacks, "on_train_end", state, unit)
+
+
+def _maybe_warn_non_persistent_workers(eval_state: PhaseState) -> None:
+    """Warn if the eval dataloader respawns its workers on each of many evaluations."""
+    dataloader = eval_state.dataloader
+    if (
+        eval_state.evaluate_every_n_steps
+        and isinstance(dataloader, torch.utils.data.DataLoader)
+        and dataloader.num_workers > 0
+        and not dataloader.persistent_workers
+    ):
+        logger.warning(
+            "The eval dataloader uses worker processes which are respawned on every evaluation, "
+            f"here every {eval_state.evaluate_every_n_steps} steps. "
+            "Consider setting `persistent_workers=True` on the eval dataloader."
+        )
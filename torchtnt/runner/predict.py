@@ -10,7 +10,7 @@ from typing import Iterable, List, Optional
 import torch
 from torchtnt.runner.callback import Callback
 
-from torchtnt.runner.state import EntryPoint, PhaseState, State
+from torchtnt.runner.state import _current_state, EntryPoint, PhaseState, State
 from torchtnt.runner.unit import TPredictData, TPredictUnit
 from torchtnt.runner.utils import (
     _is_epoch_done,
@@ -53,10 +53,12 @@ def predict(
             max_steps_per_epoch=max_steps_per_epoch,
         ),
     )
+    token = _current_state.set(state)
     try:
         _predict_impl(state, predict_unit, callbacks)
         logger.info("Finished predict")
-        logger.debug(get_timer_summary(state.timer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(get_timer_summary(state.timer))
         return state
     except Exception as e:
         # TODO: log for diagnostics
@@ -64,6 +66,8 @@ def predict(
         predict_unit.on_exception(state, e)
         _run_callback_fn(callbacks, "on_exception", state, predict_unit, e)
         raise e
+    finally:
+        _current_state.reset(token)
 
 
 @torch.no_grad()
@@ -137,8 +141,7 @@ def _predict_impl(
 
     # Possibly warn about an empty dataloader
     any_steps_completed = (
-        abs(predict_state.progress.num_steps_completed_in_epoch - prev_steps_in_epoch)
-        > 0
+        predict_state.progress.num_steps_completed_in_epoch != prev_steps_in_epoch
     )
     if not any_steps_completed:
         logger.warning("No steps completed during predict epoch!")
@@ -10,6 +10,12 @@ from typing import Any, Dict
 class Progress:
     """Class to track progress during the loop. Includes state_dict/load_state_dict for convenience for checkpointing."""
 
+    __slots__ = (
+        "_num_epochs_completed",
+        "_num_steps_completed",
+        "_num_steps_completed_in_epoch",
+    )
+
     def __init__(
         self,
         num_epochs_completed: int = 0,
@@ -10,6 +10,7 @@
 # pyre-ignore-all-errors[4]
 
 import logging
+from contextvars import ContextVar
 from enum import auto, Enum
 from typing import Any, Iterable, Optional
 
@@ -146,3 +147,25 @@ class State:
         """Signal to the loop to end after the current step completes."""
         _logger.warning("Received signal to stop")
         self._should_stop = True
+
+
+# the State of the entry point currently running, set by the entry points
+_current_state: ContextVar[State] = ContextVar("_current_state")
+
+
+def current_state() -> State:
+    """Returns the State of the entry point currently running.
+
+    This allows code called from within the loop, e.g. from a step or a callback, to access the State
+    without having it passed in.
+
+    Raises:
+        RuntimeError
+            If no entry point is currently running.
+    """
+    try:
+        return _current_state.get()
+    except LookupError:
+        raise RuntimeError(
+            "current_state() can only be called while an entry point is running."
+        ) from None
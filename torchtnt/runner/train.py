@@ -10,7 +10,7 @@ from typing import Iterable, List, Optional
 import torch
 from torchtnt.runner.callback import Callback
 from torchtnt.runner.evaluate import _evaluate_impl
-from torchtnt.runner.state import EntryPoint, PhaseState, State
+from torchtnt.runner.state import _current_state, EntryPoint, PhaseState, State
 from torchtnt.runner.unit import TTrainData, TTrainUnit
 from torchtnt.runner.utils import (
     _is_done,
@@ -62,10 +62,12 @@ def train(
             max_steps_per_epoch=max_steps_per_epoch,
         ),
     )
+    token = _current_state.set(state)
     try:
         _train_impl(state, train_unit, callbacks)
         logger.info("Finished train")
-        logger.debug(get_timer_summary(state.timer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(get_timer_summary(state.timer))
         return state
     except Exception as e:
         # TODO: log for diagnostics
@@ -73,6 +75,8 @@ def train(
         train_unit.on_exception(state, e)
         _run_callback_fn(callbacks, "on_exception", state, train_unit, e)
         raise e
+    finally:
+        _current_state.reset(token)
 
 
 def _train_impl(
@@ -132,6 +136,7 @@ def train_epoch(
         ),
     )
 
+    token = _current_state.set(state)
     try:
         logger.info(
             f"Started train_epoch with max_steps_per_epoch={max_steps_per_epoch}"
@@ -142,7 +147,8 @@ def train_epoch(
             callbacks,
         )
         logger.info("Finished train")
-        logger.debug(get_timer_summary(state.timer))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(get_timer_summary(state.timer))
         return state
     except Exception as e:
         # TODO: log for diagnostics
@@ -150,6 +156,8 @@ def train_epoch(
         train_unit.on_exception(state, e)
         _run_callback_fn(callbacks, "on_exception", state, train_unit, e)
         raise e
+    finally:
+        _current_state.reset(token)
 
 
 def _train_epoch_impl(
@@ -195,32 +203,38 @@ def _train_epoch_impl(
     pass_data_iter_to_step = _step_requires_iterator(train_unit.train_step)
     prev_steps_in_epoch = train_state.progress.num_steps_completed_in_epoch
 
+    # build the timer labels once instead of on every step
+    data_iter_next_label = "train.data_iter_next"
+    train_step_label = f"train.{train_unit.__class__.__name__}.train_step"
+
+    # bind loop invariants to locals to avoid repeated attribute lookups per step
+    timer = state.timer
+    progress = train_state.progress
+    max_steps_per_epoch = train_state.max_steps_per_epoch
+    max_steps = train_state.max_steps
+    train_step = train_unit.train_step
+
     while not (
-        state.should_stop
-        or _is_epoch_done(
-            train_state.progress, train_state.max_steps_per_epoch, train_state.max_steps
-        )
+        state.should_stop or _is_epoch_done(progress, max_steps_per_epoch, max_steps)
     ):
         try:
             if not pass_data_iter_to_step:
                 # get the next batch from the data iterator
-                with state.timer.time("train.data_iter_next"):
+                with timer.time(data_iter_next_label):
                     step_input = next(data_iter)
 
             _run_callback_fn(callbacks, "on_train_step_start", state, train_unit)
-            with state.timer.time(f"train.{train_unit.__class__.__name__}.train_step"):
-                train_state._step_output = train_unit.train_step(state, step_input)
+            with timer.time(train_step_label):
+                train_state._step_output = train_step(state, step_input)
             _run_callback_fn(callbacks, "on_train_step_end", state, train_unit)
 
             # clear step_output to avoid retaining extra memory
             train_state._step_output = None
-            train_state.progress.increment_step()
+            progress.increment_step()
 
             if (
                 evaluate_every_n_steps
-                and train_state.progress.num_steps_completed_in_epoch
-                % evaluate_every_n_steps
-                == 0
+                and progress.num_steps_completed_in_epoch % evaluate_every_n_steps == 0
             ):
                 _evaluate_impl(
                     state,
@@ -234,7 +248,7 @@ def _train_epoch_impl(
 
     # Possibly warn about an empty dataloader
     any_steps_completed = (
-        abs(train_state.progress.num_steps_completed_in_epoch - prev_steps_in_epoch) > 0
+        train_state.progress.num_steps_completed_in_epoch != prev_steps_in_epoch
     )
     if not any_steps_completed:
         logger.warning("No steps completed during train epoch!")
@@ -7,7 +7,9 @@
 import collections
 import inspect
 import logging
-from typing import Any, Callable, Dict, Iterable, List, Optional
+import sys
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import torch
 import torch.nn as nn
@@ -57,11 +59,19 @@ def _maybe_set_distributed_sampler_epoch(
 def _set_module_training_mode(
     modules: Dict[str, nn.Module], mode: bool
 ) -> Dict[str, bool]:
-    """Returns states to allow for a reset at the end of the loop."""
-    prior_module_train_states = {}
-    for name, module in modules.items():
-        prior_module_train_states[name] = module.training
-        module.train(mode)
+    """Returns states to allow for a reset at the end of the loop.
+
+    ``modules`` are the root modules tracked by the unit, not their flattened descendants:
+    ``nn.Module.train`` already recurses into submodules.
+    """
+    # record every prior state before changing any of them, as a tracked module
+    # may also be a submodule of another tracked module
+    prior_module_train_states = {
+        name: module.training for name, module in modules.items()
+    }
+    for module in modules.values():
+        if not _is_in_training_mode(module, mode):
+            module.train(mode)
     return prior_module_train_states
 
 
@@ -71,11 +81,20 @@ def _reset_module_training_mode(
     # Reset training mode for modules at the end of the epoch
     # This ensures that side-effects made by the loop are reset before
     # returning back to the user
-    for name, module in modules.items():
-        if name in prior_modes:
+    # a module contains more modules than any of its submodules, so this resets parents
+    # before the tracked modules nested in them, which Module.train would overwrite otherwise
+    for name, module in sorted(
+        modules.items(), key=lambda item: -sum(1 for _ in item[1].modules())
+    ):
+        if name in prior_modes and not _is_in_training_mode(module, prior_modes[name]):
             module.train(prior_modes[name])
 
 
+def _is_in_training_mode(module: nn.Module, mode: bool) -> bool:
+    # reading the flags is cheaper than Module.train, which sets them through Module.__setattr__
+    return all(submodule.training == mode for submodule in module.modules())
+
+
 def _run_callback_fn(
     callbacks: List[Callback],
     fn_name: str,
@@ -91,6 +110,47 @@ def _run_callback_fn(
             fn(state, *args, **kwargs)
 
 
+def _get_callback_fns(
+    callbacks: List[Callback], fn_name: str
+) -> List[Tuple[str, Callable[..., None]]]:
+    """
+    Resolves the ``fn_name`` hook of each callback once, paired with its timer label, so loops
+    can dispatch to the bound methods directly. Callbacks which don't override the no-op
+    implementation from ``Callback`` are skipped.
+    """
+    default_fn = getattr(Callback, fn_name, None)
+    callback_fns = []
+    for cb in callbacks:
+        fn = getattr(cb, fn_name)
+        if not callable(fn):
+            raise ValueError(f"Invalid callback method name provided: {fn_name}")
+        # hooks may be overridden on the class or assigned on the instance (e.g. Lambda)
+        if getattr(fn, "__func__", None) is default_fn:
+            continue
+        callback_fns.append((sys.intern(f"callback.{cb.name}.{fn_name}"), fn))
+    return callback_fns
+
+
+def _make_callback_dispatcher(
+    callbacks: List[Callback], fn_name: str
+) -> Optional[Callable[..., None]]:
+    """
+    Returns a function which runs and times the ``fn_name`` hook of each callback, with the hooks
+    resolved up front. Returns None if no callback overrides the hook, so loops can skip dispatch.
+    """
+    callback_fns = _get_callback_fns(callbacks, fn_name)
+    if not callback_fns:
+        return None
+
+    def dispatch(state: State, *args: Any, **kwargs: Any) -> None:
+        timer = state.timer
+        for label, fn in callback_fns:
+            with timer.time(label):
+                fn(state, *args, **kwargs)
+
+    return dispatch
+
+
 def log_api_usage(entry_point: str) -> None:
     torch._C._log_api_usage_once(f"torchtnt.runner.{entry_point}")
 
@@ -102,6 +162,27 @@ def _step_requires_iterator(step_func: Callable[[State, object], object]) -> boo
 
     This is closely tied to the Unit's corresponding step function signature.
     """
+    # unwrap bound methods so the cache is keyed on the underlying function
+    # instead of holding on to the unit instance
+    func = getattr(step_func, "__func__", step_func)
+    try:
+        requires_iterator = _requires_iterator_cache.get(func)
+    except TypeError:
+        # not hashable or weakly referenceable, e.g. an instance of a dataclass with __call__
+        return _func_requires_iterator(func)
+    if requires_iterator is None:
+        requires_iterator = _func_requires_iterator(func)
+        _requires_iterator_cache[func] = requires_iterator
+    return requires_iterator
+
+
+# keyed weakly so that callables assigned as step functions, such as closures, can be freed
+_requires_iterator_cache: "weakref.WeakKeyDictionary[Callable[..., object], bool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _func_requires_iterator(step_func: Callable[..., object]) -> bool:
     argspec = inspect.getfullargspec(step_func)
     annotations = argspec.annotations
     if "data" not in annotations:
@@ -44,6 +44,7 @@ from .version import (
     is_torch_version_geq_1_12,
     is_torch_version_geq_1_8,
     is_torch_version_geq_1_9,
+    is_torch_version_geq_2_0,
     is_windows,
 )
 
@@ -87,5 +88,6 @@ __all__ = [
     "is_torch_version_geq_1_12",
     "is_torch_version_geq_1_8",
     "is_torch_version_geq_1_9",
+    "is_torch_version_geq_2_0",
     "is_windows",
 ]
@@ -72,3 +72,7 @@ def is_torch_version_geq_1_11() -> bool:
 
 def is_torch_version_geq_1_12() -> bool:
     return get_torch_version() >= Version("1.12.0")
+
+
+def is_torch_version_geq_2_0() -> bool:
+    return get_torch_version() >= Version("2.0.0")